@@ -1,69 +1,246 @@
 #!/usr/bin/env python
 
-import argparse
 import os
+import re
 import subprocess
 import sys
 from pathlib import Path
-
-import yaml
+from typing import NoReturn
 
 __version__ = "0.4.1"
 
-parser = argparse.ArgumentParser(prog="autoconda")
-parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
-parser.add_argument(
-    "--path",
-    "-p",
-    help="path to start searching for environment.yml or environment.yaml (defaults to current directory)",
-    default=os.getcwd(),
-    type=Path,
+# Matches a simple top-level `name: value` line, optionally quoted and followed by a comment.
+# Unquoted values that YAML would not read as a string (numbers, booleans, nulls, ...) are left to the
+# YAML fallback: only those starting with a letter or underscore, other than the bool/null keywords, match.
+_NAME_RE = re.compile(
+    rb"""^name:[ \t]+(?:(["'])([\w.+-]+)\1|(?!(?:yes|Yes|YES|no|No|NO|true|True|TRUE|false|False|FALSE"""
+    rb"""|on|On|ON|off|Off|OFF|null|Null|NULL)(?![\w.+-]))([A-Za-z_][\w.+-]*))(?:[ \t]+#[^\r\n]*)?[ \t]*\r?$""",
+    re.MULTILINE,
 )
-parser.add_argument("command", nargs="+", help="Command and arguments to run")
+
+# Column-0 lines that are, or could be another spelling of, a top-level name key
+_KEY_LINE_RE = re.compile(rb"""^(?:name[ \t]*:|["'?&!*])""", re.MULTILINE)
+
+# Characters that open a quoted or flow context, which could swallow a following `name:` line
+_CONTEXT_OPENER_RE = re.compile(rb"""["'\[{]""")
+
+# The name is almost always near the top, so only this much of the file is scanned for it
+_HEAD_SIZE = 4096
+
+USAGE = "usage: autoconda [-h] [--version] [--path PATH] command [command ...]\n"
+
+HELP = f"""{USAGE}
+positional arguments:
+  command               Command and arguments to run
+
+options:
+  -h, --help            show this help message and exit
+  --version             show program's version number and exit
+  --path PATH, -p PATH  path to start searching for environment.yml or environment.yaml (defaults to current directory)
+"""
 
 
 def autoconda(path: Path, command: list[str]):
-    env_name = _get_conda_environment_name(path)
+    if not os.path.isdir(path):
+        print(f"Error: {path} is not a directory.", file=sys.stderr)
+        sys.exit(1)
+
+    env_file = _find_environment_file(path)
+    if env_file is None:
+        print("Error: No environment.yml or environment.yaml file found.", file=sys.stderr)
+        sys.exit(1)
 
+    env_name = _get_environment_name(env_file)
     if env_name is None:
-        print(
-            "Error: No environment.yml or environment.yaml file found or no environment name specified in the file.",
-            file=sys.stderr,
-        )
+        print(f"Error: No environment name specified in {env_file}.", file=sys.stderr)
         sys.exit(1)
 
-    result = subprocess.run(["conda", "run", "-n", env_name, "--no-capture-output", *command])
-    sys.exit(result.returncode)
+    if os.environ.get("CONDA_DEFAULT_ENV") == env_name:
+        # The environment is already active, so conda run would only repeat the activation
+        _exec(command)
+
+    _exec(["conda", "run", "-n", env_name, "--no-capture-output", *command])
+
+
+def _exec(args: list[str]) -> NoReturn:
+    try:
+        if os.name == "nt":
+            # Windows has no real exec: execvp would start a new process and exit immediately, losing its exit code
+            result = subprocess.run(args)
+            sys.exit(result.returncode)
+        # Replace this process rather than waiting on a child; execvp only returns on failure
+        os.execvp(args[0], args)
+    except FileNotFoundError:
+        print(f"Error: {args[0]} executable not found on PATH.", file=sys.stderr)
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error: cannot execute {args[0]}: {e.strerror}.", file=sys.stderr)
+        sys.exit(1)
 
 
 def _get_conda_environment_name(start_path: Path) -> str | None:
     env_file = _find_environment_file(start_path)
     if env_file is None:
         return None
-
+    return _get_environment_name(env_file)
+
+
+def _get_environment_name(env_file: Path) -> str | None:
+    head = _read_head(env_file)
+    # Drop a possibly truncated last line so a cut-off name is never matched
+    complete = head if len(head) < _HEAD_SIZE else head[: head.rfind(b"\n") + 1]
+    match = _NAME_RE.search(complete)
+    # Trust the line only if it is the sole top-level name key and cannot be part of a quoted or flow value
+    if (
+        match
+        and len(_KEY_LINE_RE.findall(complete)) == 1
+        and not _CONTEXT_OPENER_RE.search(complete, 0, match.start())
+    ):
+        return (match.group(2) or match.group(3)).decode()
+
+    # Anything the scan cannot handle (flow mappings, block scalars, ...) goes through the YAML parser
+    data = head if len(head) < _HEAD_SIZE else env_file.read_bytes()
+
+    import yaml  # deferred: only needed when the scan finds no name
+
+    # Walk parser events rather than loading the document, so no Python objects are built for the rest of it.
+    # The walk runs to the end of the root mapping because, as in a full load, the last duplicate key wins.
+    # CSafeLoader requires PyYAML built against libyaml; fall back to the pure-Python loader otherwise.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    depth = 0
+    expect_key = True
+    is_name_value = False
+    name = None
     try:
-        with open(env_file) as f:
-            data = yaml.safe_load(f)
+        for event in yaml.parse(data, Loader=loader):
+            if isinstance(event, yaml.CollectionStartEvent):
+                if depth == 0 and not isinstance(event, yaml.MappingStartEvent):
+                    return None
+                if depth == 1:
+                    if expect_key:
+                        is_name_value = False
+                    elif is_name_value:
+                        name = None
+                depth += 1
+            elif isinstance(event, yaml.CollectionEndEvent):
+                depth -= 1
+                if depth == 0:
+                    return name
+                if depth == 1:
+                    expect_key = not expect_key
+            elif isinstance(event, yaml.NodeEvent):
+                if depth == 0:
+                    return None
+                if depth != 1:
+                    continue
+                if expect_key:
+                    if isinstance(event, yaml.AliasEvent) or (event.implicit[0] and event.value == "<<"):
+                        break
+                    is_name_value = event.value == "name"
+                elif is_name_value:
+                    if isinstance(event, yaml.AliasEvent):
+                        break
+                    # Only a value the YAML loader would construct as a string counts as a name
+                    tag = event.tag
+                    if tag is None or tag == "!":
+                        tag = yaml.resolver.Resolver().resolve(yaml.ScalarNode, event.value, event.implicit)
+                    name = (tag == "tag:yaml.org,2002:str" and event.value) or None
+                expect_key = not expect_key
+        else:
+            return None
+
+        # Aliases and merge keys can only be resolved against the whole document
+        document = yaml.load(data, Loader=loader)
     except yaml.YAMLError:
         return None
 
-    return data.get("name")
+    if not isinstance(document, dict):
+        return None
+    name = document.get("name")
+    return name if isinstance(name, str) and name else None
+
+
+def _read_head(path: Path) -> bytes:
+    # A raw read skips setting up Python's buffered file object for what is usually a single read
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        return os.read(fd, _HEAD_SIZE)
+    finally:
+        os.close(fd)
 
 
-def _find_environment_file(current_path: Path) -> Path | None:
+def _find_environment_file(start_path: Path) -> Path | None:
+    # Lexical only: symlinks are not resolved, so the walk follows the path as given
+    current_path = os.path.abspath(start_path)
     while True:
-        for ext in ["yml", "yaml"]:
-            env_file = current_path / f"environment.{ext}"
-            if env_file.exists():
-                return env_file
-        if current_path == current_path.parent:
+        for name in ("environment.yml", "environment.yaml"):
+            env_file = os.path.join(current_path, name)
+            if os.path.isfile(env_file):
+                return Path(env_file)
+        parent = os.path.dirname(current_path)
+        if parent == current_path:
             return None
-        current_path = current_path.parent
+        current_path = parent
+
+
+def _parse_args(args: list[str]) -> tuple[Path, list[str]]:
+    # Hand-rolled instead of argparse, which is slow to import and build for a CLI this small
+    path = Path(os.getcwd())
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "--":
+            i += 1
+            break
+        if arg.startswith("--"):
+            # Like argparse, accept unambiguous prefixes of long options and --option=value
+            option, sep, value = arg.partition("=")
+            matches = [name for name in ("--help", "--version", "--path") if name.startswith(option)]
+            if len(matches) != 1:
+                _error(f"unrecognized arguments: {arg}")
+            option = matches[0]
+            value = value if sep else None
+        elif arg == "-h":
+            option, value = "--help", None
+        elif arg.startswith("-p"):
+            option, value = "--path", arg[2:].removeprefix("=") if len(arg) > 2 else None
+        elif arg.startswith("-") and arg != "-":
+            _error(f"unrecognized arguments: {arg}")
+        else:
+            break
+
+        if option == "--path":
+            if value is None:
+                # Like argparse, an option-looking token is never consumed as the path
+                if i + 1 == len(args) or (args[i + 1].startswith("-") and args[i + 1] != "-"):
+                    _error("argument --path/-p: expected one argument")
+                i += 1
+                value = args[i]
+            path = Path(value)
+        elif value is not None:
+            _error(f"argument {option}: ignored explicit argument {value!r}")
+        elif option == "--help":
+            print(HELP, end="")
+            sys.exit(0)
+        else:
+            print(f"autoconda {__version__}")
+            sys.exit(0)
+        i += 1
+
+    command = args[i:]
+    if not command:
+        _error("the following arguments are required: command")
+    return path, command
+
+
+def _error(message: str) -> NoReturn:
+    print(f"{USAGE}autoconda: error: {message}", file=sys.stderr)
+    sys.exit(2)
 
 
 def main():
-    args = parser.parse_args()
-    autoconda(**vars(args))
+    path, command = _parse_args(sys.argv[1:])
+    autoconda(path, command)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+from pathlib import Path
+
+import pytest
+
+from autoconda import HELP, __version__, _parse_args, autoconda
+
+
+@pytest.mark.parametrize(
+    ("args", "expected_path", "expected_command"),
+    (
+        (["python", "script.py"], Path.cwd(), ["python", "script.py"]),
+        (["--path", "foo", "python"], Path("foo"), ["python"]),
+        (["-p", "foo", "python"], Path("foo"), ["python"]),
+        (["--path=foo", "python"], Path("foo"), ["python"]),
+        (["-pfoo", "python"], Path("foo"), ["python"]),
+        (["-p=foo", "python"], Path("foo"), ["python"]),
+        (["-p=", "python", "x"], Path(""), ["python", "x"]),
+        (["-p", "-", "python"], Path("-"), ["python"]),
+        (["--pat", "foo", "python"], Path("foo"), ["python"]),
+        (["--pa=foo", "python"], Path("foo"), ["python"]),
+        (["--", "python", "--version"], Path.cwd(), ["python", "--version"]),
+        (["python", "--version", "-p", "foo"], Path.cwd(), ["python", "--version", "-p", "foo"]),
+    ),
+)
+def test_parse_args(args: list[str], expected_path: Path, expected_command: list[str]):
+    assert _parse_args(args) == (expected_path, expected_command)
+
+
+@pytest.mark.parametrize(
+    ("args", "expected_error"),
+    (
+        ([], "the following arguments are required: command"),
+        (["--"], "the following arguments are required: command"),
+        (["-p"], "argument --path/-p: expected one argument"),
+        (["-p", "--", "python"], "argument --path/-p: expected one argument"),
+        (["--path", "--version", "python"], "argument --path/-p: expected one argument"),
+        (["--bogus", "python"], "unrecognized arguments: --bogus"),
+        (["--version=1", "python"], "argument --version: ignored explicit argument '1'"),
+    ),
+)
+def test_parse_args_error(args: list[str], expected_error: str, capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit) as exc_info:
+        _parse_args(args)
+
+    assert exc_info.value.code == 2
+    assert capsys.readouterr().err.endswith(f"autoconda: error: {expected_error}\n")
+
+
+@pytest.mark.parametrize("option", ("-h", "--help", "--he"))
+def test_parse_args_help(option: str, capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit) as exc_info:
+        _parse_args([option])
+
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == HELP
+
+
+@pytest.mark.parametrize("option", ("--version", "--vers"))
+def test_parse_args_version(option: str, capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit) as exc_info:
+        _parse_args([option, "python"])
+
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == f"autoconda {__version__}\n"
+
+
+def test_autoconda_conda_not_found(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]):
+    (tmp_path / "environment.yml").write_text("name: test-env\n")
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.delenv("CONDA_DEFAULT_ENV", raising=False)
+
+    with pytest.raises(SystemExit) as exc_info:
+        autoconda(tmp_path, ["python"])
+
+    assert exc_info.value.code == 1
+    assert capsys.readouterr().err == "Error: conda executable not found on PATH.\n"
+
+
+def test_autoconda_environment_already_active(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    (tmp_path / "environment.yml").write_text("name: test-env\n")
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.setenv("CONDA_DEFAULT_ENV", "test-env")
+
+    with pytest.raises(SystemExit) as exc_info:
+        autoconda(tmp_path, ["some-command"])
+
+    assert exc_info.value.code == 1
+    assert capsys.readouterr().err == "Error: some-command executable not found on PATH.\n"
+
+
+def test_autoconda_path_not_a_directory(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    path = tmp_path / "missing"
+
+    with pytest.raises(SystemExit) as exc_info:
+        autoconda(path, ["python"])
+
+    assert exc_info.value.code == 1
+    assert capsys.readouterr().err == f"Error: {path} is not a directory.\n"
+
+
+def test_autoconda_environment_file_not_found(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit) as exc_info:
+        autoconda(tmp_path, ["python"])
+
+    assert exc_info.value.code == 1
+    assert capsys.readouterr().err == "Error: No environment.yml or environment.yaml file found.\n"
+
+
+def test_autoconda_environment_name_missing(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_text("dependencies:\n  - python\n")
+
+    with pytest.raises(SystemExit) as exc_info:
+        autoconda(tmp_path, ["python"])
+
+    assert exc_info.value.code == 1
+    assert capsys.readouterr().err == f"Error: No environment name specified in {env_file}.\n"
+
+
+def test_autoconda_command_not_executable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    (tmp_path / "environment.yml").write_text("name: test-env\n")
+    (tmp_path / "some-command").write_text("")
+    monkeypatch.setenv("CONDA_DEFAULT_ENV", "test-env")
+
+    with pytest.raises(SystemExit) as exc_info:
+        autoconda(tmp_path, [str(tmp_path / "some-command")])
+
+    assert exc_info.value.code == 1
+    assert capsys.readouterr().err == f"Error: cannot execute {tmp_path / 'some-command'}: Permission denied.\n"
@@ -20,7 +20,28 @@ def test_get_conda_environment_name_in_parent_dir(tmp_path: Path):
     subdir = tmp_path / "subdir"
     subdir.mkdir()
 
-    assert _get_conda_environment_name(tmp_path) == "test-env"
+    assert _get_conda_environment_name(subdir) == "test-env"
+
+
+def test_get_conda_environment_name_relative_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_text("name: test-env\n")
+
+    subdir = tmp_path / "subdir"
+    subdir.mkdir()
+    monkeypatch.chdir(subdir)
+
+    assert _get_conda_environment_name(Path(".")) == "test-env"
+
+
+def test_get_conda_environment_name_skips_directory(tmp_path: Path):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_text("name: test-env\n")
+
+    subdir = tmp_path / "subdir"
+    (subdir / "environment.yml").mkdir(parents=True)
+
+    assert _get_conda_environment_name(subdir) == "test-env"
 
 
 def test_get_conda_environment_name_not_found(tmp_path: Path):
@@ -34,8 +55,121 @@ def test_get_conda_environment_name_success(tmp_path: Path):
     assert _get_conda_environment_name(tmp_path) == "integration-test-env"
 
 
+@pytest.mark.parametrize(
+    "content",
+    (
+        "name: test-env\n",
+        "name: 'test-env'\n",
+        'name: "test-env"  # comment\n',
+        "channels:\n  - conda-forge\ndependencies:\n  - python=3.14\nname: test-env",
+        "{name: test-env, dependencies: [python]}\n",
+        "name: >-\n  test-env\n",
+        "? [complex, key]\n: value\nextra:\n  name: other-env\nname: !!str test-env\n",
+        "dependencies:\n  - pip:\n    - name\nname: &env test-env\n",
+        "base: &env test-env\nname: *env\n",
+        "base: &base {name: test-env}\n<<: *base\n",
+        "base: &base {name: other-env}\n<<: *base\nname: test-env\n",
+        "key: &key name\n*key : test-env\n",
+        "name: other-env\nname: test-env\n",
+        "name: other-env\n\"name\": test-env\n",
+        "name: other-env\n? name\n: test-env\n",
+        "name: test-env\n? [complex, key]\n: other-env\n",
+        "name: [other-env]\nname: test-env\n",
+        'x: "a\nname: other-env"\nname: test-env\n',
+        "x: [a,\nname: other-env]\nname: test-env\n",
+        "name: !!str test-env\n",
+        "name: test-env\r\n",
+        "name: test-env \t\n",
+        "# " + "x" * 5000 + "\nname: test-env\n",
+        "#" * 4085 + "\nname: test-env\n",
+    ),
+)
+def test_get_conda_environment_name_formats(content: str, tmp_path: Path):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_text(content)
+
+    assert _get_conda_environment_name(tmp_path) == "test-env"
+
+
+def test_get_conda_environment_name_hash_without_space(tmp_path: Path):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_text("name: test-env#x\n")
+
+    assert _get_conda_environment_name(tmp_path) == "test-env#x"
+
+
 def test_get_conda_environment_name_invalid_yaml(tmp_path: Path):
     env_file = tmp_path / "environment.yml"
     env_file.write_text("invalid: yaml: content: [[[")
 
     assert _get_conda_environment_name(tmp_path) is None
+
+
+def test_get_conda_environment_name_invalid_encoding(tmp_path: Path):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_bytes(b"channels: [\xff\xfe]\n")
+
+    assert _get_conda_environment_name(tmp_path) is None
+
+
+def test_get_conda_environment_name_invalid_yaml_after_name(tmp_path: Path):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_text("name: test-env\ninvalid: yaml: content: [[[")
+
+    assert _get_conda_environment_name(tmp_path) == "test-env"
+
+
+@pytest.mark.parametrize("content", ("", "- name: test-env\n", "test-env\n"))
+def test_get_conda_environment_name_not_a_mapping(content: str, tmp_path: Path):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_text(content)
+
+    assert _get_conda_environment_name(tmp_path) is None
+
+
+@pytest.mark.parametrize(
+    "content",
+    (
+        "name:\n",
+        "name: ~\n",
+        "name: null\n",
+        "name: NULL  # comment\n",
+        "{name: null}\n",
+        "name: [test-env]\n",
+        "name: {env: test-env}\n",
+        "base: &env [test-env]\nname: *env\n",
+        "name: 123\n",
+        "name: yes\n",
+        "name: !!int 123\n",
+        "name: !!null test-env\n",
+        "base: &env 123\nname: *env\n",
+        "name:test-env\ndependencies: []\n",
+        'x: "a\nname: test-env"\n',
+        "x: [a,\nname: test-env]\n",
+        "x: {a: 1,\nname: test-env}\n",
+    ),
+)
+def test_get_conda_environment_name_not_a_string(content: str, tmp_path: Path):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_text(content)
+
+    assert _get_conda_environment_name(tmp_path) is None
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    (
+        ("name: 'null'\n", "null"),
+        ("name: null-env\n", "null-env"),
+        ("name: '123'\n", "123"),
+        ("name: !!str 123\n", "123"),
+        ("name: 3d-env\n", "3d-env"),
+        ("name: yes-env\n", "yes-env"),
+        ("base: &env !!str 123\nname: *env\n", "123"),
+    ),
+)
+def test_get_conda_environment_name_keyword_like(content: str, expected: str, tmp_path: Path):
+    env_file = tmp_path / "environment.yml"
+    env_file.write_text(content)
+
+    assert _get_conda_environment_name(tmp_path) == expected